@@ -17,6 +17,8 @@
 
 
 from base64 import b64encode
+import codecs
+from collections import deque
 from datetime import datetime
 from .tardis import timezone, datetime_to_timestamp
 from email.utils import formatdate, parsedate_tz, mktime_tz
@@ -36,16 +38,20 @@ except ImportError:
 import json
 import logging
 from os import strerror
-from socket import error, gaierror, herror, timeout, IPPROTO_TCP, TCP_NODELAY
-from threading import local
+import re
+from socket import error, gaierror, herror, timeout, IPPROTO_TCP, TCP_NODELAY, \
+    SOL_SOCKET, SO_RCVBUF, SO_SNDBUF
+from threading import Lock
 import socket
 import ssl
 import sys
+from time import time
+from weakref import ref
 from xml.dom.minidom import parseString
 
 from .rfc3986 import URI
 from .rfc6570 import URITemplate
-from .util import xstr
+from .util import bstr, xstr
 from .kvlist import KeyValueList  # no point in another copy
 
 from . import __version__
@@ -60,14 +66,47 @@ __all__ = ["NetworkAddressError", "SocketError", "RedirectionError", "Request",
 
 json_content_types = ("application/json", "text/json")
 
+# Encoder used for JSON request bodies. This may be replaced by any object
+# with an `encode` method that returns a string or bytes, such as one
+# backed by a faster third-party JSON library.
+json_encoder = JSONEncoder(separators=(",", ":"))
+
+line_ending = re.compile(r"\r\n|\r|\n")
+
 socket_timeout = 30
 
+# Send and receive buffer sizes (in bytes) for new sockets. These are left
+# as None by default, since setting either one explicitly disables the
+# automatic buffer tuning carried out by some operating systems.
+socket_send_buffer_size = None
+socket_receive_buffer_size = None
+
+# Idle connections are kept for reuse, up to this many per network location
+# (see ConnectionPool.configure), and are discarded once they have been idle
+# for this number of seconds.
+max_idle_connections = 16
+idle_timeout = 30
+
 if sys.version_info >= (3,):
     is_unicode = lambda x: isinstance(x, str)
 else:
     is_unicode = lambda x: isinstance(x, unicode)
 
 
+def create_socket(host, port, source_address=None):
+    """ Open a TCP socket to the address given, with Nagle's algorithm
+    disabled and socket buffer sizes applied, if configured.
+    """
+    sock = socket.create_connection((host, port), socket_timeout,
+                                    source_address)
+    sock.setsockopt(IPPROTO_TCP, TCP_NODELAY, 1)
+    if socket_send_buffer_size:
+        sock.setsockopt(SOL_SOCKET, SO_SNDBUF, socket_send_buffer_size)
+    if socket_receive_buffer_size:
+        sock.setsockopt(SOL_SOCKET, SO_RCVBUF, socket_receive_buffer_size)
+    return sock
+
+
 class HTTPConnection(_HTTPConnection):
     """ Patched class to avoid Nagle's algorithm:
     https://en.wikipedia.org/wiki/Nagle%27s_algorithm
@@ -76,10 +115,7 @@ class HTTPConnection(_HTTPConnection):
     def connect(self):
         """ Connect to the host and port specified at construction.
         """
-        self.sock = socket.create_connection((self.host, self.port),
-                                             socket_timeout,
-                                             self.source_address)
-        self.sock.setsockopt(IPPROTO_TCP, TCP_NODELAY, 1)
+        self.sock = create_socket(self.host, self.port, self.source_address)
 
         if self._tunnel_host:
             self._tunnel()
@@ -93,10 +129,7 @@ class HTTPSConnection(_HTTPSConnection):
     def connect(self):
         """ Connect to the host and port specified at construction over SSL.
         """
-        sock = socket.create_connection((self.host, self.port),
-                                             socket_timeout,
-                                             self.source_address)
-        sock.setsockopt(IPPROTO_TCP, TCP_NODELAY, 1)
+        sock = create_socket(self.host, self.port, self.source_address)
 
         if self._tunnel_host:
             self.sock = sock
@@ -108,11 +141,22 @@ class HTTPSConnection(_HTTPSConnection):
 client_error_name = str("ClientError")
 server_error_name = str("ServerError")
 
+# Error classes combining each response class with ClientError or
+# ServerError, created on first use
+error_classes = {}
+
 connection_classes = {
     "http": HTTPConnection,
     "https": HTTPSConnection,
 }
 
+# Port suffixes that may be dropped from a network location without
+# changing the connection made, so that both forms share a puddle
+default_port_suffixes = {
+    "http": ":80",
+    "https": ":443",
+}
+
 default_encoding = "ISO-8859-1"
 default_chunk_size = 4096
 
@@ -121,6 +165,11 @@ log.addHandler(logging.NullHandler())
 
 redirects = {}
 
+# Reason phrases by status code, including any not known to the standard
+# library.
+reasons = dict(responses)
+reasons.setdefault(UNPROCESSABLE_ENTITY, "Unprocessable Entity")
+
 # Since the Python docs state that "symbols that are not used on the current
 # platform are not defined by the module" we have to import error codes
 # cautiously. Error numbers also vary across platforms so we cannot rely on
@@ -150,17 +199,48 @@ def make_uri(uri):
     return URI(uri)
 
 
+# Parsed `Content-Type` values, keyed by the raw header value; a server
+# will generally only ever return a handful of distinct values.
+content_types = {}
+max_content_types = 256
+
+
+def parse_content_type(value):
+    """ Split a `Content-Type` header value into its media type and
+    character set, either of which may be :py:const:`None`.
+    """
+    if value is None:
+        return None, None
+    try:
+        return content_types[value]
+    except KeyError:
+        content_type, _, parameters = value.partition(";")
+        charset = None
+        for parameter in parameters.split(";"):
+            key, _, parameter_value = parameter.strip().partition("=")
+            if key == "charset":
+                charset = parameter_value
+        parsed = content_type.strip(), charset
+        if len(content_types) >= max_content_types:
+            content_types.clear()
+        content_types[value] = parsed
+        return parsed
+
+
+default_user_agent = " ".join([
+    "HTTPStream/{0}".format(__version__),
+    "Python/{0}.{1}.{2}-{3}-{4}".format(*sys.version_info),
+    "({0})".format(sys.platform),
+])
+
+
 def user_agent(product=None):
-    ua = []
     if product:
         if isinstance(product, (tuple, list)):
-            ua.append("/".join(map(str, product)))
-        else:
-            ua.append(str(product))
-    ua.append("HTTPStream/{0}".format(__version__))
-    ua.append("Python/{0}.{1}.{2}-{3}-{4}".format(*sys.version_info))
-    ua.append("({0})".format(sys.platform))
-    return " ".join(ua)
+            product = "/".join(map(str, product))
+        return str(product) + " " + default_user_agent
+    else:
+        return default_user_agent
 
 
 class Loggable(object):
@@ -208,18 +288,28 @@ class RedirectionError(Loggable, HTTPException):
         Loggable.__init__(self, self.__class__, args[0])
 
 
-class ConnectionPuddle(local):
+class ConnectionPuddle(object):
     """ A collection of HTTP/HTTPS connections to a single network location
     (i.e. host:port). Connections may be acquired and will be created if
-    necessary; after use, these must be released.
+    necessary; after use, these must be released. A puddle may be shared
+    between threads, so a connection released by one thread can be reused
+    by another.
     """
 
     def __init__(self, connection_class, host_port):
-        local.__init__(self)
         self.__connection_class = connection_class
         self.__host_port = host_port
-        self.__active = []
-        self.__passive = []
+        self.__lock = Lock()
+        # Connections in use are only counted, not referenced, so that one
+        # abandoned after an error can still be garbage collected
+        self.__active = 0
+        self.__passive = deque()
+        # Connections discarded without the lock, awaiting removal from the
+        # active count
+        self.__discarded = deque()
+        #: Maximum number of idle connections to retain; if :py:const:`None`,
+        #: the module-wide `max_idle_connections` value is used
+        self.max_idle = None
 
     @property
     def host_port(self):
@@ -232,32 +322,72 @@ class ConnectionPuddle(local):
     def __repr__(self):
         return "<{0}({1}) active={2} passive={3}>".format(
             self.__connection_class.__name__, repr(self.host_port),
-            len(self.__active), len(self.__passive)
+            self.__active, len(self.__passive)
         )
 
     def __hash__(self):
         return hash((self.__connection_class, self.host_port))
 
     def __len__(self):
-        return len(self.__active) + len(self.__passive)
+        return self.__active - len(self.__discarded) + len(self.__passive)
+
+    def __forget_discarded(self):
+        """ Stop counting connections that have been discarded. Must be
+        called with the lock held.
+        """
+        while self.__discarded:
+            self.__discarded.popleft()
+            self.__active -= 1
+
+    def __close_idle(self):
+        """ Close and discard all passive connections that have been idle
+        for longer than the idle timeout. Must be called with the lock held.
+        """
+        expiry = time() - idle_timeout
+        while self.__passive and self.__passive[0][1] < expiry:
+            connection, _ = self.__passive.popleft()
+            connection.close()
+
+    def prune(self):
+        """ Close and discard any idle connections that have passed the
+        idle timeout.
+        """
+        with self.__lock:
+            self.__forget_discarded()
+            self.__close_idle()
 
     def acquire(self):
-        if self.__passive:
-            connection = self.__passive.pop()
-        else:
-            connection = self.__connection_class(self.host_port)
-        self.__active.append(connection)
+        with self.__lock:
+            self.__forget_discarded()
+            self.__close_idle()
+            if self.__passive:
+                connection, _ = self.__passive.pop()
+            else:
+                connection = self.__connection_class(self.host_port)
+                connection.puddle = self
+            self.__active += 1
         return connection
 
     def release(self, connection):
-        try:
-            self.__active.remove(connection)
-        except ValueError:
-            pass
-        if len(self.__passive) < 2:
-            self.__passive.append(connection)
-        else:
-            connection.close()
+        with self.__lock:
+            self.__forget_discarded()
+            self.__active -= 1
+            if self.max_idle is None:
+                max_idle = max_idle_connections
+            else:
+                max_idle = self.max_idle
+            if len(self.__passive) < max_idle:
+                self.__passive.append((connection, time()))
+            else:
+                connection.close()
+
+    def discard(self, connection):
+        """ Close an acquired connection that will not be released. No lock
+        is taken, so this is safe to call from a garbage collection callback,
+        even one that interrupts this puddle's own acquire or release.
+        """
+        connection.close()
+        self.__discarded.append(connection)
 
 
 class ConnectionPool(object):
@@ -266,56 +396,109 @@ class ConnectionPool(object):
     """
 
     _puddles = {}
+    _lock = Lock()
 
     @classmethod
-    def _get_puddle(cls, connection_class, host_port):
-        key = (connection_class, host_port)
-        if key not in cls._puddles:
-            cls._puddles[key] = ConnectionPuddle(connection_class, host_port)
-        return cls._puddles[key]
+    def _get_puddle(cls, scheme, host_port):
+        suffix = default_port_suffixes.get(scheme)
+        if suffix and host_port and host_port.endswith(suffix):
+            host_port = host_port[:-len(suffix)]
+        key = (scheme, host_port)
+        try:
+            return cls._puddles[key]
+        except KeyError:
+            # Only creation of a new puddle is locked, so that two threads
+            # cannot create rival puddles for the same network location;
+            # lookups of existing puddles need no lock.
+            with cls._lock:
+                try:
+                    return cls._puddles[key]
+                except KeyError:
+                    puddle = ConnectionPuddle(connection_classes[scheme],
+                                              host_port)
+                    cls._puddles[key] = puddle
+                    return puddle
+
+    @classmethod
+    def configure(cls, scheme, host_port, max_idle=None):
+        """ Set the maximum number of idle connections retained for a single
+        network location. A value of :py:const:`None` restores the default.
+        """
+        if scheme not in connection_classes:
+            raise ValueError("Unsupported URI scheme " + repr(scheme))
+        cls._get_puddle(scheme, host_port).max_idle = max_idle
 
     @classmethod
     def acquire(cls, scheme, host_port):
-        puddle = cls._get_puddle(connection_classes[scheme], host_port)
-        return puddle.acquire()
+        return cls._get_puddle(scheme, host_port).acquire()
 
     @classmethod
     def release(cls, connection):
-        puddle = cls._get_puddle(connection.__class__, "{0}:{1}".format(
-            connection.host, connection.port))
-        puddle.release(connection)
+        connection.puddle.release(connection)
+
+    @classmethod
+    def discard(cls, connection):
+        connection.puddle.discard(connection)
+
+    @classmethod
+    def prune(cls):
+        """ Close and discard idle connections that have passed the idle
+        timeout, across all network locations. Expired connections are
+        otherwise only discarded on the next acquisition from the same
+        location, so long-running applications may wish to call this
+        periodically.
+        """
+        for puddle in list(cls._puddles.values()):
+            puddle.prune()
+
+
+# Connections held by responses that have not yet been closed, keyed by a
+# weak reference to each response. Should a response be garbage collected
+# while still open, its connection is closed without reading any remaining
+# content and is discarded. This may happen during a garbage collection run
+# that interrupts pool code holding a puddle lock, so no lock may be taken.
+unclosed_responses = {}
+
+
+def release_unclosed(response_ref):
+    http = unclosed_responses.pop(response_ref, None)
+    if http is not None:
+        ConnectionPool.discard(http)
 
 
 def submit(method, uri, body, headers):
-    """ Submit one HTTP request.
+    """ Submit one HTTP request. The method and header names and values
+    should already be native strings.
     """
-    for key, value in headers.items():
-        del headers[key]
-        headers[xstr(key)] = xstr(value)
-    headers["Host"] = xstr(uri.host_port)
+    host_port = uri.host_port
+    headers = dict(headers)
+    headers["Host"] = xstr(host_port)
     if uri.user_info:
         credentials = uri.user_info.encode("UTF-8")
         value = "Basic " + b64encode(credentials).decode("ASCII")
         headers["Authorization"] = value
-    try:
-        http = ConnectionPool.acquire(uri.scheme, uri.host_port)
-    except KeyError:
+    if uri.scheme not in connection_classes:
         raise ValueError("Unsupported URI scheme " + repr(uri.scheme))
+    http = ConnectionPool.acquire(uri.scheme, host_port)
+    uri_string = uri.string
+    path_reference = xstr(uri.absolute_path_reference)
 
     def send(reconnect=None):
         if reconnect:
             log.info("~ Reconnecting (%s)", reconnect)
             http.close()
             http.connect()
-        if (method == "GET" or method == "DELETE") and not body:
-            log.info("> %s %s", method, uri.string)
-        elif body:
-            log.info("> %s %s [%s]", method, uri.string, len(body))
-        else:
-            log.info("> %s %s [%s]", method, uri.string, 0)
-        for key, value in headers.items():
-            log.debug("> %s: %s", key, value)
-        http.request(xstr(method), xstr(uri.absolute_path_reference), body, headers)
+        if log.isEnabledFor(logging.INFO):
+            if (method == "GET" or method == "DELETE") and not body:
+                log.info("> %s %s", method, uri_string)
+            elif body:
+                log.info("> %s %s [%s]", method, uri_string, len(body))
+            else:
+                log.info("> %s %s [%s]", method, uri_string, 0)
+            if log.isEnabledFor(logging.DEBUG):
+                for key, value in headers.items():
+                    log.debug("> %s: %s", key, value)
+        http.request(method, path_reference, body, headers)
         return http.getresponse(**getresponse_args)
 
     try:
@@ -340,7 +523,7 @@ def submit(method, uri, body, headers):
             else:
                 raise
     except (gaierror, herror) as err:
-        raise NetworkAddressError(err.args[1], host_port=uri.host_port)
+        raise NetworkAddressError(err.args[1], host_port=host_port)
     except error as err:
         if isinstance(err.args[0], tuple):
             code, description = err.args[0]
@@ -358,9 +541,9 @@ def submit(method, uri, body, headers):
             # ----
             # https://bugs.launchpad.net/ubuntu/+source/eglibc/+bug/1154599
             raise NetworkAddressError("Name or service not known",
-                                      host_port=uri.host_port)
+                                      host_port=host_port)
         else:
-            raise SocketError(code, description, host_port=uri.host_port)
+            raise SocketError(code, description, host_port=host_port)
     else:
         return http, response
 
@@ -373,14 +556,17 @@ class Request(object):
         #: HTTP method of this request
         self.__method = method
         self.__uri = make_uri(uri)
-        self.__headers = dict(headers or {})
+        if headers:
+            self.__headers = dict(headers)
+        else:
+            self.__headers = {}
         if isinstance(body, (set, frozenset)):
             body = list(body)
         if body is None:
             self.__body = body
         elif isinstance(body, (dict, list, tuple)):
             self.__headers.setdefault("Content-Type", "application/json")
-            self.__body = json.dumps(body, cls=JSONEncoder, separators=",:")
+            self.__body = bstr(json_encoder.encode(body))
         elif is_unicode(body):
             self.__headers.setdefault("Content-Type", "text/plain; charset=UTF-8")
             self.__body = body.encode("utf-8")
@@ -430,8 +616,11 @@ class Request(object):
 
         """
         uri = self.uri
+        method = xstr(self.method)
+        headers = dict((xstr(key), xstr(value))
+                       for key, value in self.headers.items())
         while True:
-            http, rs = submit(self.method, uri, self.body, self.headers)
+            http, rs = submit(method, uri, self.body, headers)
             status_class = rs.status // 100
             if status_class == 3:
                 redirection = Redirection(http, uri, self, rs, **response_kwargs)
@@ -459,6 +648,10 @@ class ContentConsumed(Exception):
 
 class Response(object):
     """ File-like object allowing consumption of an HTTP response.
+
+    A response should be closed once finished with, either explicitly or
+    by using it as a context manager, so that its connection can be reused.
+    A response discarded while still open has its connection closed.
     """
 
     @staticmethod
@@ -466,11 +659,7 @@ class Response(object):
         """ Factory method to return an instance of an appropriate Response
         subclass.
         """
-        content_type_header = response.getheader("Content-Type")
-        if content_type_header:
-            content_type = content_type_header.partition(";")[0].strip()
-        else:
-            content_type = None
+        content_type, _ = parse_content_type(response.getheader("Content-Type"))
         if content_type == "text/html":
             cls = HTMLResponse
         elif content_type in json_content_types:
@@ -482,19 +671,33 @@ class Response(object):
         else:
             cls = Response
         status_class = response.status // 100
-        if status_class == 4:
-            cls = type(client_error_name, (cls, ClientError), {})
-        elif status_class == 5:
-            cls = type(server_error_name, (cls, ServerError), {})
+        if status_class == 4 or status_class == 5:
+            try:
+                cls = error_classes[cls, status_class]
+            except KeyError:
+                if status_class == 4:
+                    error_class = type(client_error_name, (cls, ClientError), {})
+                else:
+                    error_class = type(server_error_name, (cls, ServerError), {})
+                error_classes[cls, status_class] = error_class
+                cls = error_class
         inst = cls(http, uri, request, response, **kwargs)
         if isinstance(inst, Exception):
             Exception.__init__(inst, "%s %s" % (response.status, response.reason))
-            raise inst
+            # Drop the local reference so that the traceback does not hold
+            # the response in a cycle that only the garbage collector can
+            # break.
+            try:
+                raise inst
+            finally:
+                del inst
         else:
             return inst
 
     def __init__(self, http, uri, request, response, **kwargs):
         self.__http = http
+        self.__ref = ref(self, release_unclosed)
+        unclosed_responses[self.__ref] = http
         self.__uri = uri
         self.__request = request
         self.__response = response
@@ -505,19 +708,21 @@ class Response(object):
             self.__cached = None
         self.__reason = kwargs.get("reason")
         self.__headers = KeyValueList(self.__response.getheaders())
+        self.__content_type, self.__charset = \
+            parse_content_type(self.__response.getheader("Content-Type"))
+        self.__chunked = \
+            self.__response.getheader("Transfer-Encoding") == "chunked"
         #: Default chunk size for this response
         self.chunk_size = kwargs.get("chunk_size", default_chunk_size)
-        if self.is_chunked:
-            content_length = "chunked"
-        else:
-            content_length = self.content_length
-        log.info("< %s %s [%s]", self.status_code, self.reason, content_length)
-        if __debug__:
-            for key, value in self.__response.getheaders():
-                log.debug("< %s: %s", key, value)
-
-    def __del__(self):
-        self.close()
+        if log.isEnabledFor(logging.INFO):
+            if self.is_chunked:
+                content_length = "chunked"
+            else:
+                content_length = self.content_length
+            log.info("< %s %s [%s]", self.status_code, self.reason, content_length)
+            if log.isEnabledFor(logging.DEBUG):
+                for key, value in self.__headers:
+                    log.debug("< %s: %s", key, value)
 
     def __repr__(self):
         if self.is_chunked:
@@ -538,9 +743,9 @@ class Response(object):
         return False
 
     def __iter__(self):
-        """ Iterate through the content as bytes.
+        """ Iterate through the content as chunks of bytes.
         """
-        return iter(self.content or b"")
+        return self.raw_chunks()
 
     @property
     def cache(self):
@@ -574,6 +779,7 @@ class Response(object):
                 pass
             else:
                 self.__consumed = True
+            unclosed_responses.pop(self.__ref, None)
             ConnectionPool.release(self.__http)
             self.__http = None
 
@@ -605,17 +811,13 @@ class Response(object):
     def reason(self):
         """ The reason phrase attached to this response.
         """
-        if self.__reason:
-            return self.__reason
-        else:
+        if not self.__reason:
             try:
-                return responses[self.status_code]
+                self.__reason = reasons[self.status_code]
             except KeyError:
-                if self.status_code == 422:
-                    return "Unprocessable Entity"
-                else:
-                    raise SystemError("HTTP status code %s is not known by the "
-                                      "Python standard library" % self.status_code)
+                raise SystemError("HTTP status code %s is not known by the "
+                                  "Python standard library" % self.status_code)
+        return self.__reason
 
     @property
     def headers(self):
@@ -648,14 +850,7 @@ class Response(object):
     def content_type(self):
         """ The type of content as provided by the `Content-Type` header field.
         """
-        try:
-            content_type = [
-                _.strip()
-                for _ in self.__response.getheader("Content-Type").split(";")
-            ]
-        except AttributeError:
-            return None
-        return content_type[0]
+        return self.__content_type
 
     @property
     def date(self):
@@ -667,14 +862,10 @@ class Response(object):
     def encoding(self):
         """ The content character set encoding.
         """
-        try:
-            content_type = dict(
-                _.strip().partition("=")[0::2]
-                for _ in self.__response.getheader("Content-Type").split(";")
-            )
-        except AttributeError:
+        if self.__charset is None:
             return default_encoding
-        return content_type.get("charset", default_encoding)
+        else:
+            return self.__charset
 
     @property
     def expires(self):
@@ -687,21 +878,20 @@ class Response(object):
         """ The suggested filename from the `Content-Disposition` header field
         or the final segment of the path name if no such header is available.
         """
-        default_filename = self.uri.path.segments[-1]
-        try:
-            content_type = dict(
-                _.strip().partition("=")[0::2]
-                for _ in self.__response.getheader("Content-Disposition").split(";")
-            )
-        except AttributeError:
-            return default_filename
-        return content_type.get("filename", default_filename)
+        filename = self.uri.path.segments[-1]
+        disposition = self.__response.getheader("Content-Disposition")
+        if disposition is not None:
+            for parameter in disposition.split(";"):
+                key, _, value = parameter.strip().partition("=")
+                if key == "filename":
+                    filename = value
+        return filename
 
     @property
     def is_chunked(self):
         """ Indicates whether or not the content is chunked.
         """
-        return self.__response.getheader("Transfer-Encoding") == "chunked"
+        return self.__chunked
 
     @property
     def last_modified(self):
@@ -735,6 +925,28 @@ class Response(object):
             if self.__consumed:
                 self.close()
 
+    def raw_chunks(self, chunk_size=None):
+        """ Iterate through the content as chunks of bytes, without any
+        decoding. If no chunk size is specified, the default chunk size for
+        this response is used.
+        """
+        try:
+            if not chunk_size:
+                chunk_size = self.chunk_size
+            if self.__consumed and self.cache:
+                if isinstance(self.__cached, bytearray):
+                    self.__cached = bytes(self.__cached)
+                cached = self.__cached
+                for start in range(0, len(cached), chunk_size):
+                    yield cached[start:start + chunk_size]
+                return
+            data = self.read(chunk_size)
+            while data:
+                yield data
+                data = self.read(chunk_size)
+        finally:
+            self.close()
+
     def _get_date_header(self, name):
         """ Get the value of the specified header interpreted as an HTTP date and return
         as an aware Python `datetime` instance, or `None` if the header is unavailable.
@@ -785,50 +997,51 @@ class TextResponse(Response):
         size is specified, a default of 4096 is used.
         """
         try:
-            if not chunk_size:
-                chunk_size = self.chunk_size
-            pending = bytearray()
-            data = True
-            while data:
-                data = self.read(chunk_size)
-                pending.extend(data)
-                decoded = None
-                while data and not decoded:
-                    try:
-                        decoded = pending.decode(self.encoding)
-                    except UnicodeDecodeError:
-                        data = self.read(1)
-                        pending.extend(data)
-                    else:
-                        del pending[:]
-                        yield decoded
+            decoder = codecs.getincrementaldecoder(self.encoding)()
+            for data in self.raw_chunks(chunk_size):
+                decoded = decoder.decode(data)
+                if decoded:
+                    yield decoded
+            decoded = decoder.decode(b"", final=True)
+            if decoded:
+                yield decoded
         finally:
             self.close()
 
     def lines(self, keep_ends=False):
         """ Iterate through the content as lines of text.
         """
-        data = ""
+        pending = []
+        carriage_return = False
         for chunk in self.chunks():
-            data += chunk
-            while "\r" in data or "\n" in data:
-                cr, lf = data.find("\r"), data.find("\n")
-                if cr >= 0 and lf == cr + 1:
-                    eol_pos, eol_len = cr, 2
-                else:
-                    if cr >= 0 and lf >= 0:
-                        eol_pos = min(cr, lf)
-                    else:
-                        eol_pos = cr if cr >= 0 else lf
-                    eol_len = 1
-                x = eol_pos + eol_len
+            if carriage_return:
+                chunk = "\r" + chunk
+            # A trailing CR might be the first half of a CRLF pair, so
+            # hold it back until the next chunk arrives.
+            carriage_return = chunk.endswith("\r")
+            if carriage_return:
+                chunk = chunk[:-1]
+            start = 0
+            for eol in line_ending.finditer(chunk):
                 if keep_ends:
-                    line, data = data[:x], data[x:]
+                    end = eol.end()
+                else:
+                    end = eol.start()
+                if pending:
+                    pending.append(chunk[start:end])
+                    yield "".join(pending)
+                    pending = []
                 else:
-                    line, data = data[:eol_pos], data[x:]
-                yield line
-        if data:
-            yield data
+                    yield chunk[start:end]
+                start = eol.end()
+            if start < len(chunk):
+                pending.append(chunk[start:])
+        if carriage_return:
+            if keep_ends:
+                pending.append("\r")
+            yield "".join(pending)
+        elif pending:
+            yield "".join(pending)
 
     def __iter__(self):
         """ Iterate through the content as lines of text.
@@ -967,8 +1180,10 @@ class Resource(object):
     def __get_or_head(self, method, if_modified_since=None, headers=None, redirect_limit=5, **kwargs):
         """ Issue a ``GET`` or ``HEAD`` request to this resource.
         """
-        headers = dict(headers or {})
         if if_modified_since:
+            # Request takes its own copy of the headers, so one is only
+            # needed here when adding to them
+            headers = dict(headers or {})
             headers["If-Modified-Since"] = formatdate(datetime_to_timestamp(if_modified_since), usegmt=True)
         rq = Request(method, self.uri, None, headers)
         return rq.submit(redirect_limit=redirect_limit, **kwargs)
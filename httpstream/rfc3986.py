@@ -25,6 +25,8 @@ See: http://www.ietf.org/rfc/rfc3986.txt
 
 from __future__ import unicode_literals
 
+import re
+
 from .kvlist import KeyValueList
 from .util import bstr, ustr
 
@@ -33,9 +35,13 @@ __all__ = ["general_delimiters", "subcomponent_delimiters",
            "reserved", "unreserved", "percent_encode", "percent_decode",
            "ParameterString", "Authority", "Path", "Query", "URI"]
 
-percent_codes = dict(zip(bytes(bytearray(range(256))),
+all_bytes = bytes(bytearray(range(256)))
+percent_codes = dict(zip(all_bytes,
                          [bstr("%" + hex(n)[2:].upper().zfill(2)) for n in range(256)]))
-unhex = dict(zip(b"0123456789ABCDEFabcdef", list(range(0, 16)) + list(range(10, 16))))
+hex_digits = bytearray(b"0123456789ABCDEFabcdef")
+percent_decodes = dict((bytes(bytearray([hi, lo])),
+                        bytes(bytearray([int(chr(hi) + chr(lo), 16)])))
+                       for hi in hex_digits for lo in hex_digits)
 
 # RFC 3986 § 2.2.
 general_delimiters = ":/?#[]@"
@@ -47,6 +53,32 @@ unreserved = bstr("ABCDEFGHIJKLMNOPQRSTUVWXYZ"
                   "abcdefghijklmnopqrstuvwxyz"
                   "0123456789-._~")
 
+# Percent encoding tables, keyed by the extra characters deemed safe. Each
+# is a pair of the bytes left unencoded and a 256-item list mapping every
+# byte value to its encoded form.
+encoding_tables = {}
+max_encoding_tables = 64
+
+
+def get_encoding_table(safe):
+    try:
+        return encoding_tables[safe]
+    except KeyError:
+        keep = (unreserved + safe).replace(b"%", b"")
+        table = [percent_codes[char] for char in all_bytes]
+        for n in bytearray(keep):
+            table[n] = all_bytes[n:n + 1]
+        if len(encoding_tables) >= max_encoding_tables:
+            encoding_tables.clear()
+        encoding_tables[safe] = keep, table
+        return keep, table
+
+
+# RFC 3986 § 3 (see Appendix B). Every string matches, giving the scheme,
+# authority, path, query and fragment.
+uri_pattern = re.compile(r"^(?:([^:/?#]+):)?(?://([^/?#]*))?([^?#]*)(?:\?([^#]*))?(?:#(.*))?$",
+                         re.DOTALL)
+
 
 # RFC 3986 § 2.1.
 def percent_encode(data, safe=None):
@@ -66,20 +98,14 @@ def percent_encode(data, safe=None):
             key + "=" + percent_encode(value, safe=safe)
             for key, value in data.items()
         )
-    unreserved_and_safe = unreserved + bstr(safe or b"")
+    keep, table = get_encoding_table(bstr(safe or b""))
     chars = bstr(data)
-    out = []
-    p = 0
-    for i, char in enumerate(chars):
-        if char == b"%" or char not in unreserved_and_safe:
-            out.append(chars[p:i])
-            out.append(percent_codes[char])
-            p = i + 1
-    out.append(chars[p:])
+    if chars.translate(None, keep):
+        chars = b"".join(map(table.__getitem__, bytearray(chars)))
     if isinstance(data, (bytes, bytearray)):
-        return b"".join(out)
+        return chars
     else:
-        return u"".join(map(ustr, out))
+        return ustr(chars)
 
 
 def percent_decode(data):
@@ -87,11 +113,15 @@ def percent_decode(data):
     """
     if data is None:
         return None
-    parts = bstr(data).split(b"%")
-    out = [parts[0].replace(b"+", b" ")]
-    for i, part in enumerate(parts[1:], start=1):
-        out.append(bytes(bytearray([(unhex[part[0]] << 4) + unhex[part[1]]])))
-        out.append(part[2:].replace(b"+", b" "))
+    # No escape sequence contains a "+" so these can be replaced up front
+    chars = bstr(data).replace(b"+", b" ")
+    if b"%" not in chars:
+        return chars.decode("utf-8")
+    parts = chars.split(b"%")
+    out = [parts[0]]
+    for part in parts[1:]:
+        out.append(percent_decodes[part[:2]])
+        out.append(part[2:])
     return b"".join(out).decode("utf-8")
 
 
@@ -99,6 +129,8 @@ class Part(object):
     """ Internal base class for all URI component parts.
     """
 
+    __slots__ = ()
+
     @classmethod
     def _cast(cls, obj):
         """ Convert the object supplied to an instance of this class, if
@@ -114,6 +146,11 @@ class Part(object):
     def __init__(self):
         pass
 
+    def __reduce__(self):
+        # Slotted instances cannot be pickled by the default protocol 0 and 1
+        # machinery, so rebuild from the string form instead
+        return self.__class__, (self.string,)
+
     def __repr__(self):
         if self.string is None:
             return "%s" % self.__class__.__name__
@@ -124,6 +161,8 @@ class Part(object):
         return self.string or ""
 
     def __eq__(self, other):
+        if other is self:
+            return True
         if other is None:
             return self.string is None
         try:
@@ -154,21 +193,25 @@ class Part(object):
 
 class ParameterString(Part):
 
-    __string = NotImplemented
+    __slots__ = ("__separator", "__none", "__parameters", "__string")
 
     def __init__(self, string, separator):
         super(ParameterString, self).__init__()
+        self.__string = NotImplemented
         self.__separator = separator
         self.__none = string is None
         self.__parameters = KeyValueList()
         if string:
-            bits = string.split(self.__separator)
-            for bit in bits:
-                if "=" in bit:
-                    key, value = map(percent_decode, bit.partition("=")[0::2])
+            append = self.__parameters.append
+            for bit in string.split(self.__separator):
+                key, equals, value = bit.partition("=")
+                if equals:
+                    append(percent_decode(key), percent_decode(value))
                 else:
-                    key, value = percent_decode(bit), None
-                self.__parameters.append(key, value)
+                    append(percent_decode(key), None)
+
+    def __reduce__(self):
+        return self.__class__, (self.string, self.__separator)
 
     def __len__(self):
         return self.__parameters.__len__()
@@ -251,15 +294,27 @@ class Authority(Part):
         else:
             return host, None
 
+    __slots__ = ("__user_info", "__host", "__port", "__string", "__host_port")
+
     __instances = {}
 
+    @classmethod
+    def __blank(cls):
+        inst = super(Authority, cls).__new__(cls)
+        inst.__user_info = None
+        inst.__host = None
+        inst.__port = None
+        inst.__string = NotImplemented
+        inst.__host_port = NotImplemented
+        return inst
+
     def __new__(cls, string=None):
         if string is None:
-            return super(Authority, cls).__new__(cls)
+            return cls.__blank()
         try:
             inst = cls.__instances[string]
         except KeyError:
-            inst = super(Authority, cls).__new__(cls)
+            inst = cls.__blank()
             user_info, at, host_port = string.rpartition("@")
             if at:
                 inst.__user_info = percent_decode(user_info)
@@ -267,12 +322,6 @@ class Authority(Part):
             cls.__instances[string] = inst
         return inst
 
-    __user_info = None
-    __host = None
-    __port = None
-
-    __string = NotImplemented
-
     def __init__(self, string=None):
         super(Authority, self).__init__()
 
@@ -331,10 +380,14 @@ class Authority(Part):
 
         :return:
         """
-        u = [self.__host]
-        if self.__port is not None:
-            u += [":", ustr(self.__port)]
-        return "".join(u)
+        if self.__host_port is NotImplemented:
+            if self.__host is None:
+                self.__host_port = None
+            elif self.__port is None:
+                self.__host_port = self.__host
+            else:
+                self.__host_port = self.__host + ":" + ustr(self.__port)
+        return self.__host_port
 
     @property
     def port(self):
@@ -383,16 +436,13 @@ class Authority(Part):
         :return:
         """
         if self.__string is NotImplemented:
-            if self.__host is None:
+            if self.__user_info is None:
+                self.__string = self.host_port
+            elif self.__host is None:
                 self.__string = None
             else:
-                u = []
-                if self.__user_info is not None:
-                    u += [percent_encode(self.__user_info), "@"]
-                u += [self.__host]
-                if self.__port is not None:
-                    u += [":", ustr(self.__port)]
-                self.__string = "".join(u)
+                self.__string = (percent_encode(self.__user_info) + "@" +
+                                 self.host_port)
         return self.__string
         
     @property
@@ -449,13 +499,18 @@ class Authority(Part):
 
 class Path(Part):
 
-    __segments = None
-    __string = NotImplemented
+    __slots__ = ("__segments", "__string")
 
     def __init__(self, string):
         super(Path, self).__init__()
-        if string is not None:
+        self.__string = NotImplemented
+        if string is None:
+            self.__segments = None
+        elif "%" in string or "+" in string:
             self.__segments = tuple(map(percent_decode, string.split("/")))
+        else:
+            # nothing to decode
+            self.__segments = tuple(ustr(string).split("/"))
 
     def __hash__(self):
         return hash(self.string)
@@ -466,7 +521,13 @@ class Path(Part):
             if self.__segments is None:
                 self.__string = None
             else:
-                self.__string = "/".join(map(percent_encode, self.__segments))
+                string = "/".join(self.__segments)
+                if string.count("/") == len(self.__segments) - 1:
+                    # no segment contains a slash of its own, so the path
+                    # can be encoded in one go
+                    self.__string = percent_encode(string, safe="/")
+                else:
+                    self.__string = "/".join(map(percent_encode, self.__segments))
         return self.__string
 
     @property
@@ -482,33 +543,20 @@ class Path(Part):
     def remove_dot_segments(self):
         """ Implementation of RFC3986, section 5.2.4
         """
-        inp = self.string
-        out = ""
-        while inp:
-            if inp.startswith("../"):
-                inp = inp[3:]
-            elif inp.startswith("./"):
-                inp = inp[2:]
-            elif inp.startswith("/./"):
-                inp = inp[2:]
-            elif inp == "/.":
-                inp = "/"
-            elif inp.startswith("/../"):
-                inp = inp[3:]
-                out = out.rpartition("/")[0]
-            elif inp == "/..":
-                inp = "/"
-                out = out.rpartition("/")[0]
-            elif inp in (".", ".."):
-                inp = ""
-            else:
-                if inp.startswith("/"):
-                    inp = inp[1:]
-                    out += "/"
-                seg, slash, inp = inp.partition("/")
-                out += seg
-                inp = slash + inp
-        return Path(out)
+        segments = (self.string or "").split("/")
+        out = []
+        for segment in segments:
+            if segment == "..":
+                if out:
+                    out.pop()
+                    if not out:
+                        # what follows is still preceded by a slash
+                        out.append("")
+            elif segment != ".":
+                out.append(segment)
+        if segments[-1] in (".", ".."):
+            out.append("")
+        return Path("/".join(out))
 
     def with_trailing_slash(self):
         if self.__segments is None:
@@ -531,11 +579,16 @@ class Path(Part):
 
 class Query(ParameterString):
 
+    __slots__ = ()
+
     SEPARATOR = "&"
 
     def __init__(self, string):
         super(Query, self).__init__(string, self.SEPARATOR)
 
+    def __reduce__(self):
+        return self.__class__, (self.string,)
+
     def __hash__(self):
         return hash(self.string)
 
@@ -567,7 +620,15 @@ class URI(Part):
         - fragment
 
         """
-        uri = URI(parts.get("string"))
+        # URI objects may be shared, so the parts of any source string
+        # are copied into a new instance rather than altered in place
+        source = URI(parts.get("string"))
+        uri = URI(None)
+        uri.__scheme = source.__scheme
+        uri.__authority = source.__authority
+        uri.__path = source.__path
+        uri.__query = source.__query
+        uri.__fragment = source.__fragment
         uri.__set_hierarchical_part(parts.get("hierarchical_part"))
         uri.__set_absolute_path_reference(parts.get("absolute_path_reference"))
         uri.__set_authority(parts.get("authority"))
@@ -610,42 +671,55 @@ class URI(Part):
         else:
             return None, Path(value)
 
+    __slots__ = ("__scheme", "__authority", "__path", "__query", "__fragment",
+                 "__string", "__absolute_path_reference")
+
+    __instances = {}
+    __max_instances = 1024
+
+    @classmethod
+    def __blank(cls):
+        inst = super(cls, URI).__new__(cls)
+        inst.__scheme = None
+        inst.__authority = None
+        inst.__path = None
+        inst.__query = None
+        inst.__fragment = None
+        inst.__string = NotImplemented
+        inst.__absolute_path_reference = NotImplemented
+        return inst
+
     def __new__(cls, value=None):
         if isinstance(value, cls):
             return value
-        inst = super(cls, URI).__new__(cls)
+        if value is not None:
+            value = getattr(value, "__uri__", value)
         if value is None:
-            return inst
-        try:
-            if value.__uri__ is None:
-                return inst
-        except AttributeError:
-            pass
+            return cls.__blank()
+        value = ustr(value)
         try:
-            value = ustr(value.__uri__)
-        except AttributeError:
-            value = ustr(value)
-        # scheme
-        if ":" in value:
-            inst.__scheme, _, value = value.partition(":")
-            inst.__scheme = percent_decode(inst.__scheme)
-        else:
-            inst.__scheme = None
-        # fragment
-        value, inst.__fragment = cls._partition_fragment(value)
-        # query
-        value, inst.__query = cls._partition_query(value)
-        # hierarchical part
-        inst.__authority, inst.__path = cls._parse_hierarchical_part(value)
-        return inst
-
-    __scheme = None
-    __authority = None
-    __path = None
-    __query = None
-    __fragment = None
+            return cls.__instances[value]
+        except KeyError:
+            inst = cls.__parse(value)
+            if len(cls.__instances) >= cls.__max_instances:
+                cls.__instances.clear()
+            cls.__instances[value] = inst
+            return inst
 
-    __string = NotImplemented
+    @classmethod
+    def __parse(cls, value):
+        inst = cls.__blank()
+        scheme, authority, path, query, fragment = uri_pattern.match(value).groups()
+        if scheme is not None:
+            inst.__scheme = percent_decode(scheme)
+        if authority is not None:
+            inst.__authority = Authority(authority)
+        inst.__path = Path(path)
+        if query:
+            inst.__query = Query(query)
+        if fragment:
+            inst.__fragment = percent_decode(fragment)
+        return inst
 
     def __init__(self, value=None):
         Part.__init__(self)
@@ -654,7 +728,7 @@ class URI(Part):
         return hash(self.string)
 
     def __add__(self, other):
-        return URI("{0}{1}".format(self, other))
+        return URI(ustr(self) + ustr(other))
 
     @property
     def __uri__(self):
@@ -674,14 +748,28 @@ class URI(Part):
         if string is not None:
             self.__authority = Authority(string)
 
+    def __detach_authority(self):
+        # Authority objects are cached and shared, so must be copied
+        # before being modified
+        authority = Authority(None)
+        if self.__authority is None:
+            authority._Authority__host = ""
+        else:
+            authority._Authority__user_info = self.__authority.user_info
+            authority._Authority__host = self.__authority.host
+            authority._Authority__port = self.__authority.port
+        self.__authority = authority
+        return authority
+
     def __set_host_port(self, string):
         if string is not None:
             if self.__authority is None:
                 self.__authority = Authority(string)
             else:
                 host, port = Authority._parse_host_port(string)
-                self.__authority._Authority__host = host
-                self.__authority._Authority__port = port
+                authority = self.__detach_authority()
+                authority._Authority__host = host
+                authority._Authority__port = port
 
     def __set_scheme(self, string):
         if string is not None:
@@ -689,22 +777,18 @@ class URI(Part):
 
     def __set_user_info(self, string):
         if string is not None:
-            if self.__authority is None:
-                self.__authority = Authority("")
-            self.__authority._Authority__user_info = string
+            self.__detach_authority()._Authority__user_info = string
 
     def __set_host(self, string):
         if string is not None:
             if self.__authority is None:
                 self.__authority = Authority(string)
             else:
-                self.__authority._Authority__host = string
+                self.__detach_authority()._Authority__host = string
 
     def __set_port(self, number):
         if number is not None:
-            if self.__authority is None:
-                self.__authority = Authority("")
-            self.__authority._Authority__port = number
+            self.__detach_authority()._Authority__port = number
 
     def __set_path(self, string):
         if string is not None:
@@ -755,17 +839,12 @@ class URI(Part):
             if self.__path is None:
                 self.__string = None
             else:
-                u = []
-                if self.__scheme is not None:
-                    u += [percent_encode(self.__scheme), ":"]
+                string = self.absolute_path_reference
                 if self.__authority is not None:
-                    u += ["//", ustr(self.__authority)]
-                u += [ustr(self.__path)]
-                if self.__query is not None:
-                    u += ["?", ustr(self.__query)]
-                if self.__fragment is not None:
-                    u += ["#", percent_encode(self.__fragment)]
-                self.__string = "".join(u)
+                    string = "//" + ustr(self.__authority) + string
+                if self.__scheme is not None:
+                    string = percent_encode(self.__scheme) + ":" + string
+                self.__string = string
         return self.__string
 
     @property
@@ -989,11 +1068,10 @@ class URI(Part):
         """
         if self.__path is None:
             return None
-        u = []
-        if self.__authority is not None:
-            u += ["//", ustr(self.__authority)]
-        u += [ustr(self.__path)]
-        return "".join(u)
+        if self.__authority is None:
+            return ustr(self.__path)
+        else:
+            return "//" + ustr(self.__authority) + ustr(self.__path)
 
     @property
     def absolute_path_reference(self):
@@ -1012,14 +1090,17 @@ class URI(Part):
             :py:const:`None`
         :rtype: percent-encoded string or :py:const:`None`
         """
-        if self.__path is None:
-            return None
-        u = [ustr(self.__path)]
-        if self.__query is not None:
-            u += ["?", ustr(self.__query)]
-        if self.__fragment is not None:
-            u += ["#", percent_encode(self.__fragment)]
-        return "".join(u)
+        if self.__absolute_path_reference is NotImplemented:
+            if self.__path is None:
+                self.__absolute_path_reference = None
+            else:
+                string = ustr(self.__path)
+                if self.__query is not None:
+                    string += "?" + ustr(self.__query)
+                if self.__fragment is not None:
+                    string += "#" + percent_encode(self.__fragment)
+                self.__absolute_path_reference = string
+        return self.__absolute_path_reference
 
     def _merge_path(self, relative_path_reference):
         if self.__authority is not None and not self.__path:
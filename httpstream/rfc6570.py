@@ -38,6 +38,8 @@ class URITemplate(Part):
     This class exposes a full implementation of RFC6570.
     """
 
+    __slots__ = ("__template",)
+
     @classmethod
     def __cast(cls, obj):
         if obj is None:
@@ -65,7 +67,7 @@ class URITemplate(Part):
                 else:
                     explode = False
                 if ":" in key:
-                    key, max_length = key.partition(":")[0::2]
+                    key, _, max_length = key.partition(":")
                     max_length = int(max_length)
                 else:
                     max_length = None
@@ -142,12 +144,15 @@ class URITemplate(Part):
             else:
                 return self._expand(expression)
 
-    _tokeniser = re.compile("(\{)([^{}]*)(\})")
+    _tokeniser = re.compile(r"\{([^{}]*)\}")
 
     def __init__(self, template):
         super(URITemplate, self).__init__()
         self.__template = template
 
+    def __reduce__(self):
+        return self.__class__, (self.__template,)
+
     def __eq__(self, other):
         other = self.__cast(other)
         return self.__template == other.__template
@@ -169,15 +174,10 @@ class URITemplate(Part):
         """
         if self.__template is None:
             return URI(None)
+        # splitting leaves literal text at even indexes and the expressions
+        # found between braces at odd indexes
         tokens = self._tokeniser.split(self.__template)
         expander = URITemplate._Expander(values)
-        out = []
-        while tokens:
-            token = tokens.pop(0)
-            if token == "{":
-                expression = tokens.pop(0)
-                tokens.pop(0)
-                out.append(expander.expand(expression))
-            else:
-                out.append(token)
-        return URI("".join(out))
+        for i in range(1, len(tokens), 2):
+            tokens[i] = expander.expand(tokens[i])
+        return URI("".join(tokens))
@@ -28,6 +28,7 @@ def test_can_parse_none_authority():
     assert auth.user_info is None
     assert auth.host is None
     assert auth.port is None
+    assert auth.host_port is None
 
 
 def test_can_parse_empty_authority():
@@ -20,7 +20,8 @@ from __future__ import unicode_literals
 
 from jsonstream import assembled, grouped
 
-from httpstream import http, Resource, ResourceTemplate, RedirectionError, TextResponse, JSONResponse, HTMLResponse
+from httpstream import http, Resource, ResourceTemplate, RedirectionError, TextResponse, JSONResponse, HTMLResponse, \
+    ClientError, ServerError
 from httpstream.numbers import *
 
 
@@ -83,6 +84,105 @@ def test_can_set_default_encoding():
     assert http.default_encoding == "UTF-8"
 
 
+def test_can_parse_content_type():
+    assert http.parse_content_type(None) == (None, None)
+    assert http.parse_content_type("text/plain") == ("text/plain", None)
+    assert http.parse_content_type("text/html; charset=UTF-8") == ("text/html", "UTF-8")
+
+
+def test_parsed_content_type_is_reused():
+    parsed = http.parse_content_type("application/json; charset=UTF-8")
+    assert http.parse_content_type("application/json; charset=UTF-8") is parsed
+
+
+def test_can_replace_json_encoder():
+
+    class Encoder(object):
+        def encode(self, obj):
+            return b"{}"
+
+    json_encoder = http.json_encoder
+    http.json_encoder = Encoder()
+    try:
+        request = http.Request("POST", "http://localhost:8080/", {"one": 1})
+    finally:
+        http.json_encoder = json_encoder
+    assert request.body == b"{}"
+    assert request.headers["Content-Type"] == "application/json"
+
+
+def test_released_connection_is_reused():
+    puddle = http.ConnectionPuddle(http.HTTPConnection, "localhost:8080")
+    connection = puddle.acquire()
+    puddle.release(connection)
+    assert puddle.acquire() is connection
+
+
+def test_idle_connection_is_discarded_after_timeout():
+    puddle = http.ConnectionPuddle(http.HTTPConnection, "localhost:8080")
+    connection = puddle.acquire()
+    puddle.release(connection)
+    idle_timeout = http.idle_timeout
+    http.idle_timeout = -1
+    try:
+        assert puddle.acquire() is not connection
+    finally:
+        http.idle_timeout = idle_timeout
+
+
+def test_can_configure_idle_connections_per_host():
+    http.ConnectionPool.configure("http", "localhost:8081", max_idle=0)
+    try:
+        connection = http.ConnectionPool.acquire("http", "localhost:8081")
+        http.ConnectionPool.release(connection)
+        assert http.ConnectionPool.acquire("http", "localhost:8081") is not connection
+    finally:
+        http.ConnectionPool.configure("http", "localhost:8081")
+
+
+def test_pool_can_prune_idle_connections():
+    connection = http.ConnectionPool.acquire("http", "localhost:8080")
+    http.ConnectionPool.release(connection)
+    idle_timeout = http.idle_timeout
+    http.idle_timeout = -1
+    try:
+        http.ConnectionPool.prune()
+    finally:
+        http.idle_timeout = idle_timeout
+    assert http.ConnectionPool.acquire("http", "localhost:8080") is not connection
+
+
+def test_connection_without_explicit_port_is_returned_to_its_puddle():
+    connection = http.ConnectionPool.acquire("http", "localhost")
+    http.ConnectionPool.release(connection)
+    assert http.ConnectionPool.acquire("http", "localhost") is connection
+
+
+def test_default_port_shares_a_puddle_with_no_port():
+    assert http.ConnectionPool._get_puddle("http", "localhost:80") is \
+        http.ConnectionPool._get_puddle("http", "localhost")
+    assert http.ConnectionPool._get_puddle("https", "localhost:443") is \
+        http.ConnectionPool._get_puddle("https", "localhost")
+    assert http.ConnectionPool._get_puddle("http", "localhost:8080") is not \
+        http.ConnectionPool._get_puddle("http", "localhost")
+
+
+def test_threads_share_a_single_puddle_per_network_location():
+    from threading import Thread
+    puddles = []
+
+    def get_puddle():
+        puddles.append(http.ConnectionPool._get_puddle("http", "localhost:8082"))
+
+    threads = [Thread(target=get_puddle) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(puddles) == 8
+    assert all(puddle is puddles[0] for puddle in puddles)
+
+
 def test_can_get_simple_text_resource():
     resource = Resource("http://localhost:8080/hello")
     response = resource.get()
@@ -102,6 +202,66 @@ def test_can_get_simple_text_resource_with_caching():
     assert response.content == "hello, world"
 
 
+def test_can_get_raw_chunks_of_text_resource():
+    resource = Resource("http://localhost:8080/hello")
+    with resource.get() as response:
+        assert b"".join(response.raw_chunks(5)) == b"hello, world"
+
+
+def test_can_iterate_cached_content_after_it_has_been_read():
+    resource = Resource("http://localhost:8080/hello")
+    with resource.get(cache=True) as response:
+        assert response.content == "hello, world"
+        assert b"".join(response.raw_chunks(5)) == b"hello, world"
+        assert list(response) == ["hello, world"]
+
+
+def test_unclosed_response_releases_connection_when_discarded():
+    response = Resource("http://localhost:8080/hello").get()
+    assert not response.closed
+    count = len(http.unclosed_responses)
+    del response
+    assert len(http.unclosed_responses) == count - 1
+
+
+def test_discarded_response_does_not_wait_for_the_puddle_lock():
+    from threading import Thread
+    responses = [Resource("http://localhost:8080/hello").get()]
+    count = len(http.unclosed_responses)
+    puddle = http.ConnectionPool._get_puddle("http", "localhost:8080")
+
+    def discard_while_locked():
+        with puddle._ConnectionPuddle__lock:
+            del responses[:]
+
+    thread = Thread(target=discard_while_locked)
+    thread.daemon = True
+    thread.start()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert len(http.unclosed_responses) == count - 1
+
+
+def test_error_response_is_released_without_garbage_collection():
+    import gc
+
+    def get_missing_person():
+        try:
+            Resource("http://localhost:8080/person/nobody").get()
+        except (ClientError, ServerError):
+            pass
+        else:
+            assert False
+
+    count = len(http.unclosed_responses)
+    gc.disable()
+    try:
+        get_missing_person()
+        assert len(http.unclosed_responses) == count
+    finally:
+        gc.enable()
+
+
 def test_can_put_simple_text_resource():
     resource = Resource("http://localhost:8080/hello")
     response = resource.put("fred")
@@ -154,6 +314,14 @@ def test_can_get_multi_line_cyrillic_text_resource():
             assert line == expected_lines.pop(0)
 
 
+def test_can_decode_characters_split_across_chunks():
+    resource = Resource("http://localhost:8080/war_and_peace")
+    with resource.get() as response:
+        chunks = list(response.chunks(1))
+    assert "".join(chunks) == WAR_AND_PEACE
+    assert all(len(chunk) == 1 for chunk in chunks)
+
+
 def test_can_get_multi_line_hebrew_text_resource():
     resource = Resource("http://localhost:8080/genesis")
     expected_lines = GENESIS.splitlines()
@@ -164,6 +332,16 @@ def test_can_get_multi_line_hebrew_text_resource():
             assert line == expected_lines.pop(0)
 
 
+def test_crlf_split_across_chunks_ends_a_single_line():
+    resource = Resource("http://localhost:8080/crlf")
+    with resource.get() as response:
+        response.chunk_size = 4
+        assert list(response) == ["one", "two", "three"]
+    with resource.get() as response:
+        response.chunk_size = 4
+        assert list(response.lines(keep_ends=True)) == ["one\r\n", "two\r\n", "three"]
+
+
 def test_can_get_big_resource_with_small_chunk_size():
     resource = Resource("http://localhost:8080/lorem_ipsum")
     expected_lines = LOREM_IPSUM.splitlines()
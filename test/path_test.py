@@ -135,6 +135,18 @@ def test_can_remove_dot_segments_when_starts_with_double_dot():
     assert path_out == "a"
 
 
+def test_can_remove_dot_segments_beyond_root():
+    path_in = Path("/a/../../b/..")
+    path_out = path_in.remove_dot_segments()
+    assert path_out == "/"
+
+
+def test_can_remove_dot_segments_when_ends_with_double_dot():
+    path_in = Path("a/b/..")
+    path_out = path_in.remove_dot_segments()
+    assert path_out == "a/"
+
+
 def test_can_add_trailing_slash_to_path():
     path = Path("/foo/bar")
     path = path.with_trailing_slash()
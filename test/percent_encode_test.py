@@ -69,3 +69,10 @@ def test_can_percent_encode_extended_chars():
 def test_can_percent_encode_with_safe_chars():
     encoded = percent_encode("/El Niño/", safe="/|\\")
     assert encoded == "/El%20Ni%C3%B1o/"
+
+
+def test_encoding_tables_are_bounded():
+    from httpstream import rfc3986
+    for n in range(2 * rfc3986.max_encoding_tables):
+        assert percent_encode("a b", safe=str(n)) == "a%20b"
+    assert len(rfc3986.encoding_tables) <= rfc3986.max_encoding_tables
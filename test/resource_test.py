@@ -19,7 +19,8 @@
 from __future__ import unicode_literals
 
 from httpstream import \
-    Resource, NetworkAddressError, SocketError, ResourceTemplate, URI, URITemplate
+    Resource, NetworkAddressError, SocketError, ResourceTemplate, URI, URITemplate, \
+    ClientError, ServerError
 
 
 def test_bad_hostname_will_fail():
@@ -45,6 +46,18 @@ def test_bad_port_will_fail():
         assert False
 
 
+def test_error_responses_share_a_class():
+    error_classes = []
+    for _ in range(2):
+        try:
+            Resource("http://localhost:8080/person/nobody").get()
+        except (ClientError, ServerError) as err:
+            error_classes.append(err.__class__)
+        else:
+            assert False
+    assert error_classes[0] is error_classes[1]
+
+
 def test_can_get_simple_uri():
     resource = Resource("http://localhost:8080/person/")
     rs = resource.get()
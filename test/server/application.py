@@ -137,6 +137,12 @@ def genesis():
     return GENESIS
 
 
+@get('/crlf')
+def crlf():
+    response.content_type = "text/plain; charset=utf-8"
+    return "one\r\ntwo\r\nthree"
+
+
 @get('/object')
 def object_():
     return OBJECT
@@ -32,6 +32,15 @@ def test_expansion_with_no_variables():
     assert uri == URI("")
 
 
+def test_uri_template_can_be_pickled():
+    import pickle
+    uri_template = URITemplate("http://example.com/{path}{?query}")
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        copy = pickle.loads(pickle.dumps(uri_template, protocol))
+        assert copy.__class__ is URITemplate
+        assert copy == uri_template
+
+
 def _test_expansions(expansions):
     variables = {
         "count": ("one", "two", "three"),
@@ -66,6 +75,13 @@ def test_empty_expansion():
     })
 
 
+def test_stray_braces_are_treated_as_literals():
+    _test_expansions({
+        "{{var}": "%7Bvalue",
+        "}{var}{": "%7Dvalue%7B",
+    })
+
+
 def test_can_expand_simple_strings():
     _test_expansions({
         "{var}": "value",
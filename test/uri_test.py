@@ -159,6 +159,26 @@ def test_can_parse_uri_without_scheme():
     assert uri.absolute_path_reference == ""
 
 
+def test_can_parse_uri_without_scheme_with_port_and_path():
+    uri = URI("//example.com:80/x")
+    assert uri.string == "//example.com:80/x"
+    assert uri.scheme is None
+    assert uri.authority == "example.com:80"
+    assert uri.host == "example.com"
+    assert uri.port == 80
+    assert uri.path == "/x"
+
+
+def test_can_parse_relative_path_containing_colon():
+    uri = URI("a/b:c")
+    assert uri.scheme is None
+    assert uri.authority is None
+    assert uri.path == "a/b:c"
+    assert list(uri.path.segments) == ["a", "b:c"]
+    assert uri.query is None
+    assert uri.fragment is None
+
+
 def test_can_parse_simple_uri():
     uri = URI("foo://example.com")
     assert str(uri) == "foo://example.com"
@@ -238,6 +258,21 @@ def test_can_parse_full_uri():
     assert uri.absolute_path_reference == "/over/there?name=ferret#nose"
 
 
+def test_uri_can_be_pickled():
+    import pickle
+    uri = URI("http://bob@example.com:8080/foo/bar?q=1&r#frag")
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        for part in (uri, uri.authority, uri.path, uri.query):
+            copy = pickle.loads(pickle.dumps(part, protocol))
+            assert copy.__class__ is part.__class__
+            assert copy == part
+
+
+def test_can_add_to_uri():
+    assert URI("http://example.com/") + "foo" == "http://example.com/foo"
+    assert URI("http://example.com/") + "café" == "http://example.com/caf%C3%A9"
+
+
 def test_uri_representation():
     uri = URI("http://example.com/")
     representation = repr(uri)
@@ -662,3 +697,15 @@ def test_can_build_uri_from_scheme_authority_and_port():
     assert uri.port == 3456
     assert uri.host_port == "example.com:3456"
     assert uri.absolute_path_reference == ""
+
+
+def test_parsed_uris_are_reused():
+    assert URI("http://example.com/foo") is URI("http://example.com/foo")
+
+
+def test_building_from_a_string_does_not_alter_other_uris():
+    original = URI("http://example.com:8080/foo")
+    uri = URI.build(string="http://example.com:8080/foo", host="example.net")
+    assert uri == "http://example.net:8080/foo"
+    assert original == "http://example.com:8080/foo"
+    assert URI("http://example.com:8080/bar").host == "example.com"